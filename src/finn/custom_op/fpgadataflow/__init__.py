@@ -30,6 +30,7 @@ from abc import abstractmethod
 import numpy as np
 import os
 import subprocess
+from pyverilator import PyVerilator
 from finn.custom_op import CustomOp
 from finn.util.basic import CppBuilder
 from finn.util.fpgadataflow import (
@@ -45,6 +46,11 @@ class HLSCustomOp(CustomOp):
     custom node should have. Some as abstract methods, these have to be filled
     when writing a new fpgadataflow custom op node."""
 
+    # PyVerilator objects built by get_rtlsim, shared between instances since
+    # a new HLSCustomOp is created for each node execution. Entries (and the
+    # compiled models they hold) stay alive until clear_rtlsim_cache is called.
+    _rtlsim_cache = {}
+
     def __init__(self, onnx_node):
         super().__init__(onnx_node)
 
@@ -234,6 +240,39 @@ compilation transformations?
         process_execute = subprocess.Popen(executable_path, stdout=subprocess.PIPE)
         process_execute.communicate()
 
+    def get_rtlsim(self):
+        """Returns a PyVerilator object for the verilog generated for this node by
+        the HLSSynth_IPGen transformation. Since building with Verilator is
+        expensive, the object is reused for later calls unless the verilog file
+        has been modified in the meantime."""
+        node = self.onnx_node
+        code_gen_dir = self.get_nodeattr("code_gen_dir_ipgen")
+        verilog_path = "{}/project_{}/sol1/impl/verilog/".format(
+            code_gen_dir, node.name
+        )
+        verilog_file = "{}{}_{}.v".format(verilog_path, node.name, node.name)
+        # the mtime lookup also checks that the needed file exists
+        try:
+            mtime = os.path.getmtime(verilog_file)
+        except OSError:
+            raise Exception(
+                """Found no verilog files for this node,
+                did you run the codegen_ipgen transformation?"""
+            ) from None
+        if verilog_file in HLSCustomOp._rtlsim_cache:
+            (cached_mtime, sim) = HLSCustomOp._rtlsim_cache[verilog_file]
+            if cached_mtime == mtime:
+                return sim
+        sim = PyVerilator.build(verilog_file, verilog_path=[verilog_path])
+        HLSCustomOp._rtlsim_cache[verilog_file] = (mtime, sim)
+        return sim
+
+    @classmethod
+    def clear_rtlsim_cache(cls):
+        """Removes all PyVerilator objects cached by get_rtlsim, e.g. to free
+        memory after simulating many different nodes."""
+        cls._rtlsim_cache.clear()
+
     def reset_rtlsim(self, sim):
         """Sets reset input in pyverilator to zero, toggles the clock and set it
         back to one"""
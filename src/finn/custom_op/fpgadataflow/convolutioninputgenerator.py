@@ -29,7 +29,6 @@
 import os
 
 import numpy as np
-from pyverilator import PyVerilator
 
 from finn.core.datatype import DataType
 from finn.custom_op.fpgadataflow import HLSCustomOp
@@ -114,7 +113,7 @@ class ConvolutionInputGenerator(HLSCustomOp):
             # create a npy file for input of the node
 
             inp = context[node.input[0]]
-            assert str(inp.dtype) == "float32", "Input datatype is not float32"
+            assert inp.dtype == np.float32, "Input datatype is not float32"
             assert inp.shape == (
                 1,
                 ifm_ch,
@@ -129,9 +128,10 @@ class ConvolutionInputGenerator(HLSCustomOp):
             # load output npy file
             super().npy_to_dynamic_output(context)
             if self.get_output_datatype() == DataType.BIPOLAR:
+                # output was freshly loaded from file, convert in place
                 out = context[node.output[0]]
-                out = 2 * out - 1
-                context[node.output[0]] = out
+                out *= 2
+                out -= 1
             assert context[node.output[0]].shape == (
                 1,
                 out_pix,
@@ -144,59 +144,40 @@ class ConvolutionInputGenerator(HLSCustomOp):
                 1, out_pix, k * k * ifm_ch
             )
         elif mode == "rtlsim":
-            code_gen_dir = self.get_nodeattr("code_gen_dir_ipgen")
-            prefixed_top_name = "%s_%s" % (node.name, node.name)
-            # check if needed file exists
-            verilog_file = "{}/project_{}/sol1/impl/verilog/{}.v".format(
-                code_gen_dir, node.name, prefixed_top_name
+            sim = self.get_rtlsim()
+            inp = context[node.input[0]]
+            inp = inp.transpose(0, 2, 3, 1)
+            inp = inp.flatten()
+
+            # TODO: check how to sort inputs for multichannel inputs
+            # a = []
+            # for i in range(len(inp)):
+            #     if (i+1) % 2 == 0:
+            #         a.append((int(inp[i-1]) << 1) + int(inp[i]))
+            # inp = a
+            super().reset_rtlsim(sim)
+            super().toggle_clk(sim)
+            output = self.rtlsim(sim, inp)
+            output = [int(x) for x in output]
+            odt = self.get_output_datatype()
+            if odt == DataType.BIPOLAR:
+                output = [2 * x - 1 for x in output]
+
+            # pyverilator interprets int2 as uint2, so output has to be corrected
+            elif odt == DataType.INT2:
+                mask = 2 ** (odt.bitwidth() - 1)
+                output = [-(x & mask) + (x & ~mask) for x in output]
+            # TODO: check how to sort inputs for multichannel inputs
+            # output = [bin(x)[2:].zfill(ifm_ch) for x in output]
+            # output_ch1 = [int(x[:1]) for x in output]
+            # output_ch2 = [int(x[1:]) for x in output]
+
+            # reshape output
+            output = np.asarray(output, dtype=np.float32).reshape(
+                1, out_pix, k * k * ifm_ch
             )
-            if os.path.isfile(verilog_file):
-                inp = context[node.input[0]]
-                inp = inp.transpose(0, 2, 3, 1)
-                inp = inp.flatten()
-
-                # TODO: check how to sort inputs for multichannel inputs
-                # a = []
-                # for i in range(len(inp)):
-                #     if (i+1) % 2 == 0:
-                #         a.append((int(inp[i-1]) << 1) + int(inp[i]))
-                # inp = a
-                sim = PyVerilator.build(
-                    verilog_file,
-                    verilog_path=[
-                        "{}/project_{}/sol1/impl/verilog/".format(
-                            code_gen_dir, node.name
-                        )
-                    ],
-                )
-                super().reset_rtlsim(sim)
-                super().toggle_clk(sim)
-                output = self.rtlsim(sim, inp)
-                output = [int(x) for x in output]
-                odt = self.get_output_datatype()
-                if odt == DataType.BIPOLAR:
-                    output = [2 * x - 1 for x in output]
-
-                # pyverilator interprets int2 as uint2, so output has to be corrected
-                elif odt == DataType.INT2:
-                    mask = 2 ** (odt.bitwidth() - 1)
-                    output = [-(x & mask) + (x & ~mask) for x in output]
-                # TODO: check how to sort inputs for multichannel inputs
-                # output = [bin(x)[2:].zfill(ifm_ch) for x in output]
-                # output_ch1 = [int(x[:1]) for x in output]
-                # output_ch2 = [int(x[1:]) for x in output]
-
-                # reshape output
-                output = np.asarray([output], dtype=np.float32).reshape(
-                    1, out_pix, k * k * ifm_ch
-                )
-                context[node.output[0]] = output
+            context[node.output[0]] = output
 
-            else:
-                raise Exception(
-                    """Found no verilog files for this node,
-                    did you run the codegen_ipgen transformation?"""
-                )
         else:
             raise Exception(
                 """Invalid value for attribute exec_mode! Is currently set to: {}
@@ -30,7 +30,6 @@ import math
 import os
 
 import numpy as np
-from pyverilator import PyVerilator
 
 from finn.core.datatype import DataType
 from finn.custom_op.fpgadataflow import HLSCustomOp
@@ -485,6 +484,8 @@ class StreamingFCLayer_Batch(HLSCustomOp):
         pe = self.get_nodeattr("PE")
         sf = mw // simd
         nf = mh // pe
+        idt = self.get_input_datatype()
+        odt = self.get_output_datatype()
 
         # TODO ensure codegen dir exists
         if mode == "npysim":
@@ -499,7 +500,8 @@ class StreamingFCLayer_Batch(HLSCustomOp):
                 )
             )
 
-        # create a npy file fore each input of the node (in_ind is input index)
+        # prepare the data input of the node (in_ind is input index), for npysim
+        # it is stored in a npy file for the compiled node to read
         in_ind = 0
         for inputs in node.input:
             # it is assumed that the first input of the node is the data input
@@ -507,21 +509,24 @@ class StreamingFCLayer_Batch(HLSCustomOp):
             # the third input are the thresholds
             if in_ind == 0:
                 assert (
-                    str(context[inputs].dtype) == "float32"
+                    context[inputs].dtype == np.float32
                 ), """Input datatype is
                 not float32 as expected."""
                 expected_inp_shape = (1, sf, simd)
                 reshaped_input = context[inputs].reshape(expected_inp_shape)
-                if self.get_input_datatype() == DataType.BIPOLAR:
+                if idt == DataType.BIPOLAR:
                     # store bipolar activations as binary
-                    reshaped_input = (reshaped_input + 1) / 2
+                    # (the addition makes a copy, the halving is in place)
+                    reshaped_input = reshaped_input + 1
+                    reshaped_input /= 2
                     export_idt = DataType.BINARY
                 else:
-                    export_idt = self.get_input_datatype()
-                np.save(
-                    os.path.join(code_gen_dir, "input_{}.npy".format(in_ind)),
-                    reshaped_input,
-                )
+                    export_idt = idt
+                if mode == "npysim":
+                    np.save(
+                        os.path.join(code_gen_dir, "input_{}.npy".format(in_ind)),
+                        reshaped_input,
+                    )
             elif in_ind > 2:
                 raise Exception("Unexpected input found for StreamingFCLayer")
             in_ind += 1
@@ -532,10 +537,11 @@ class StreamingFCLayer_Batch(HLSCustomOp):
             # load output npy file
             super().npy_to_dynamic_output(context)
             # reinterpret binary output as bipolar where needed
-            if self.get_output_datatype() == DataType.BIPOLAR:
+            if odt == DataType.BIPOLAR:
+                # output was freshly loaded from file, convert in place
                 out = context[node.output[0]]
-                out = 2 * out - 1
-                context[node.output[0]] = out
+                out *= 2
+                out -= 1
             assert context[node.output[0]].shape == (
                 1,
                 nf,
@@ -545,53 +551,23 @@ class StreamingFCLayer_Batch(HLSCustomOp):
             # reshape output to have expected shape
             context[node.output[0]] = context[node.output[0]].reshape(1, mh)
         elif mode == "rtlsim":
-            prefixed_top_name = "%s_%s" % (node.name, node.name)
-            # check if needed file exists
-            verilog_file = "{}/project_{}/sol1/impl/verilog/{}.v".format(
-                code_gen_dir, node.name, prefixed_top_name
+            sim = self.get_rtlsim()
+            nbits = self.get_instream_width()
+            # pass the input array directly instead of going through a npy file
+            inp = npy_to_rtlsim_input(reshaped_input, export_idt, nbits)
+            super().reset_rtlsim(sim)
+            super().toggle_clk(sim)
+            output = self.rtlsim(sim, inp)
+            target_bits = odt.bitwidth()
+            packed_bits = self.get_outstream_width()
+            # the output is used directly, no need to save it as npy file
+            output = rtlsim_output_to_npy(
+                output, None, odt, (1, nf, pe), packed_bits, target_bits
             )
-            if os.path.isfile(verilog_file):
-                nbits = self.get_instream_width()
-                inp = npy_to_rtlsim_input(
-                    "{}/input_0.npy".format(code_gen_dir), export_idt, nbits
-                )
-                sim = PyVerilator.build(
-                    verilog_file,
-                    verilog_path=[
-                        "{}/project_{}/sol1/impl/verilog/".format(
-                            code_gen_dir, node.name
-                        )
-                    ],
-                )
-                super().reset_rtlsim(sim)
-                super().toggle_clk(sim)
-                output = self.rtlsim(sim, inp)
-                odt = self.get_output_datatype()
-                target_bits = odt.bitwidth()
-                packed_bits = self.get_outstream_width()
-                out_npy_path = "{}/output.npy".format(code_gen_dir)
-                rtlsim_output_to_npy(
-                    output, out_npy_path, odt, (1, nf, pe), packed_bits, target_bits
-                )
-
-                # load and reshape output
-                output = np.load(out_npy_path)
-                output = np.asarray([output], dtype=np.float32).reshape(1, mh)
-                context[node.output[0]] = output
 
-            else:
-                raise Exception(
-                    """Found no verilog files for this node,
-                    did you run the codegen_ipgen transformation?"""
-                )
-
-        else:
-            raise Exception(
-                """Invalid value for attribute exec_mode! Is currently set to: {}
-            has to be set to one of the following value ("npysim", "rtlsim")""".format(
-                    mode
-                )
-            )
+            # reshape output, already float32 so this is a view
+            output = output.reshape(1, mh)
+            context[node.output[0]] = output
 
     def global_includes(self):
         self.code_gen_dict["$GLOBALS$"] = ['#include "weights.hpp"']
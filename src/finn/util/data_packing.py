@@ -269,35 +269,107 @@ def npy_to_rtlsim_input(input_file, input_dtype, pad_to_nbits, reverse_inner=Tru
     integers, packing the innermost dimension. See
     finn.util.basic.pack_innermost_dim_as_hex_string() for more info on how the
     packing works. If reverse_inner is set, the innermost dimension will be
-    reversed prior to packing."""
+    reversed prior to packing.
+
+    The packing is done with vectorized NumPy bit operations and produces the
+    same values as going through pack_innermost_dim_as_hex_string."""
     if issubclass(type(input_file), np.ndarray):
         inp = input_file
     elif os.path.isfile(input_file):
         inp = np.load(input_file)
     else:
         raise Exception("input_file must be ndarray or filename for .npy")
-    packed_data = pack_innermost_dim_as_hex_string(
-        inp, input_dtype, pad_to_nbits, reverse_inner=reverse_inner
-    )
-    packed_data = packed_data.flatten()
-    packed_data = [int(x[2:], 16) for x in packed_data]
-    return packed_data
+    if inp.dtype != np.float32:
+        # try to convert to a float numpy array (container dtype is float)
+        inp = np.asarray(inp, dtype=np.float32)
+    if input_dtype == DataType.BIPOLAR:
+        # convert bipolar values to binary
+        inp = (inp + 1) / 2
+        input_dtype = DataType.BINARY
+    if pad_to_nbits < 4:
+        pad_to_nbits = 4
+    elem_bits = input_dtype.bitwidth()
+    n_elems = inp.shape[-1]
+    if elem_bits * n_elems > pad_to_nbits:
+        raise Exception("Number of bits is greater than pad_to_nbits")
+    # get the bit pattern of each element
+    if input_dtype.is_integer():
+        # ensure that all values are permitted by chosen dtype
+        assert (
+            (inp >= input_dtype.min()).all()
+            and (inp <= input_dtype.max()).all()
+            and (inp == np.round(inp)).all()
+        ), "This value is not permitted by chosen dtype."
+        # masking yields the two's complement representation for signed types
+        elems = inp.astype(np.int64) & ((1 << elem_bits) - 1)
+        elems = elems.astype("<u4")
+    else:
+        elems = np.ascontiguousarray(inp, dtype="<f4").view("<u4")
+    # expand to bits, least significant bit first, going through the bytes of
+    # each element so that the temporaries stay uint8 arrays
+    elem_bytes = elems[..., np.newaxis].view(np.uint8)
+    bits = np.unpackbits(elem_bytes, axis=-1, bitorder="little")[..., :elem_bits]
+    if not reverse_inner:
+        # the first element ends up in the most significant position
+        bits = np.flip(bits, axis=-2)
+    bits = bits.reshape(-1, n_elems * elem_bits)
+    packed_bytes = np.packbits(bits, axis=-1, bitorder="little")
+    return [int.from_bytes(x.tobytes(), "little") for x in packed_bytes]
 
 
 def rtlsim_output_to_npy(
     output, path, dtype, shape, packedBits, targetBits, reverse_inner=True
 ):
     """Convert a flattened sequence of Python arbitrary-precision integers
-    output into a NumPy array, saved as npy file at path. Each arbitrary-precision
-    integer is assumed to be a packed array of targetBits-bit elements, which
-    will be unpacked as the innermost dimension of the NumPy array."""
+    output into a NumPy array, saved as npy file at path unless path is None.
+    Each arbitrary-precision integer is assumed to be a packed array of
+    elements of the given dtype, which will be unpacked as the innermost
+    dimension of the NumPy array. The element width is taken from
+    dtype.bitwidth(), targetBits is ignored. packedBits is the width of each
+    packed integer and has to hold the innermost dimension, any bits above the
+    innermost dimension are ignored.
+
+    The unpacking is done with vectorized NumPy bit operations and produces the
+    same values as going through unpack_innermost_dim_from_hex_string."""
 
     # TODO should have its own testbench?
-    output = np.asarray([hex(int(x)) for x in output])
-    out_array = unpack_innermost_dim_from_hex_string(
-        output, dtype, shape, packedBits=packedBits, reverse_inner=reverse_inner
+    elem_bits = dtype.bitwidth()
+    n_elems = shape[-1]
+    n_words = 1
+    for dim in shape[:-1]:
+        n_words = n_words * dim
+    word_bits = n_elems * elem_bits
+    if word_bits > packedBits:
+        raise Exception("Number of bits is greater than packedBits")
+    word_bytes = roundup_to_integer_multiple(word_bits, 8) // 8
+    # only the lowest word_bits bits of each packed word carry elements
+    word_mask = (1 << word_bits) - 1
+    packed_bytes = b"".join(
+        (int(x) & word_mask).to_bytes(word_bytes, "little") for x in output[:n_words]
     )
-    np.save(path, out_array)
+    packed_bytes = np.frombuffer(packed_bytes, dtype=np.uint8)
+    packed_bytes = packed_bytes.reshape(n_words, word_bytes)
+    # expand to bits, least significant bit first
+    bits = np.unpackbits(packed_bytes, axis=-1, bitorder="little")
+    bits = bits[:, :word_bits].reshape(n_words, n_elems, elem_bits)
+    elems = bits.astype(np.int64).dot(1 << np.arange(elem_bits, dtype=np.int64))
+    if reverse_inner is False:
+        # the first element is in the most significant position
+        elems = np.flip(elems, axis=-1)
+
+    # interpret output values correctly
+
+    # interpret values as bipolar
+    if dtype == DataType.BIPOLAR:
+        elems = 2 * elems - 1
+    # interpret values as signed values
+    elif dtype.name.startswith("INT"):
+        mask = 2 ** (elem_bits - 1)
+        elems = -(elems & mask) + (elems & ~mask)
+
+    out_array = np.asarray(elems, dtype=np.float32).reshape(shape)
+    if path is not None:
+        np.save(path, out_array)
     return out_array
 
 
@@ -0,0 +1,127 @@
+# Copyright (c) 2020, Xilinx
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of FINN nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import os
+
+import pytest
+
+from onnx import helper
+from pyverilator import PyVerilator
+
+from finn.custom_op.fpgadataflow import HLSCustomOp
+from finn.custom_op.registry import getCustomOp
+
+
+def make_fclayer_node(code_gen_dir):
+    node = helper.make_node(
+        "StreamingFCLayer_Batch",
+        ["inp", "weights"],
+        ["outp"],
+        domain="finn",
+        backend="fpgadataflow",
+        name="StreamingFCLayer_Batch_0",
+        code_gen_dir_ipgen=code_gen_dir,
+    )
+    return node
+
+
+def make_verilog_file(node):
+    code_gen_dir = getCustomOp(node).get_nodeattr("code_gen_dir_ipgen")
+    verilog_path = "{}/project_{}/sol1/impl/verilog/".format(code_gen_dir, node.name)
+    verilog_file = "{}{}_{}.v".format(verilog_path, node.name, node.name)
+    os.makedirs(verilog_path)
+    open(verilog_file, "w").close()
+    return (verilog_path, verilog_file)
+
+
+@pytest.fixture
+def fake_build(monkeypatch):
+    """Replaces PyVerilator.build by a stub that records its arguments, and
+    empties the rtlsim cache afterwards so that no stub objects are left in it."""
+    built = []
+
+    def build(verilog_file, verilog_path):
+        built.append((verilog_file, verilog_path))
+        return object()
+
+    monkeypatch.setattr(PyVerilator, "build", build)
+    HLSCustomOp.clear_rtlsim_cache()
+    yield built
+    HLSCustomOp.clear_rtlsim_cache()
+
+
+def test_fpgadataflow_rtlsim_cache(tmpdir, fake_build):
+    built = fake_build
+    node = make_fclayer_node(str(tmpdir))
+
+    # missing verilog file
+    with pytest.raises(Exception, match="Found no verilog files"):
+        getCustomOp(node).get_rtlsim()
+    assert built == []
+
+    (verilog_path, verilog_file) = make_verilog_file(node)
+    # first call builds, second call on a new wrapper reuses the simulator
+    sim = getCustomOp(node).get_rtlsim()
+    assert len(built) == 1
+    assert getCustomOp(node).get_rtlsim() is sim
+    assert len(built) == 1
+
+    # a newer verilog file triggers a rebuild
+    mtime = os.path.getmtime(verilog_file)
+    os.utime(verilog_file, (mtime + 10, mtime + 10))
+    new_sim = getCustomOp(node).get_rtlsim()
+    assert new_sim is not sim
+    assert len(built) == 2
+    assert getCustomOp(node).get_rtlsim() is new_sim
+
+    # clearing the cache forces a rebuild
+    HLSCustomOp.clear_rtlsim_cache()
+    assert getCustomOp(node).get_rtlsim() is not new_sim
+    assert len(built) == 3
+
+
+def test_fpgadataflow_rtlsim_paths(tmpdir, monkeypatch, fake_build):
+    built = fake_build
+    node = make_fclayer_node(str(tmpdir))
+    (verilog_path, verilog_file) = make_verilog_file(node)
+
+    # the verilog file is checked with a single stat call per get_rtlsim
+    stat_calls = []
+    getmtime = os.path.getmtime
+
+    def counting_getmtime(path):
+        stat_calls.append(path)
+        return getmtime(path)
+
+    monkeypatch.setattr(os.path, "getmtime", counting_getmtime)
+    getCustomOp(node).get_rtlsim()
+    getCustomOp(node).get_rtlsim()
+    assert stat_calls == [verilog_file, verilog_file]
+    # the paths are resolved from code_gen_dir_ipgen and handed to the build
+    assert built == [(verilog_file, [verilog_path])]
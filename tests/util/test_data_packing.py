@@ -39,6 +39,7 @@ from finn.core.datatype import DataType
 from finn.util.data_packing import (
     array2hexstring,
     finnpy_to_packed_bytearray,
+    npy_to_rtlsim_input,
     numpy_to_hls_code,
     pack_innermost_dim_as_hex_string,
     packed_bytearray_to_finnpy,
@@ -146,6 +147,34 @@ def test_pack_innermost_dim_as_hex_string():
     ).all()
 
 
+def test_npy_to_rtlsim_input():
+    A = np.asarray([[1, 1, 1, 0], [0, 1, 1, 0]], dtype=np.float32)
+    assert npy_to_rtlsim_input(A, DataType.BINARY, 8, reverse_inner=False) == [14, 6]
+    assert npy_to_rtlsim_input(A, DataType.BINARY, 8) == [7, 6]
+    B = np.asarray([[[3, 3], [3, 3]], [[1, 3], [3, 1]]], dtype=np.float32)
+    assert npy_to_rtlsim_input(B, DataType.UINT2, 8) == [15, 15, 13, 7]
+    C = np.asarray([[1, -1, 1, -1]], dtype=np.float32)
+    assert npy_to_rtlsim_input(C, DataType.INT2, 8, reverse_inner=False) == [0x77]
+    assert npy_to_rtlsim_input(C, DataType.BIPOLAR, 8, reverse_inner=False) == [0x0A]
+    D = np.asarray([[-1, 17.125]], dtype=np.float32)
+    assert npy_to_rtlsim_input(D, DataType.FLOAT32, 64, reverse_inner=False) == [
+        0xBF80000041890000
+    ]
+    # packed words wider than 64 bits
+    E = np.asarray([[-4, 0, -4, -4]], dtype=np.float32)
+    eE = 0xFFFFFFFC00000000FFFFFFFCFFFFFFFC
+    assert npy_to_rtlsim_input(E, DataType.INT32, 128, reverse_inner=False) == [eE]
+    # vectorized packing must agree with hex string packing
+    for dtype in [DataType.BIPOLAR, DataType.UINT3, DataType.INT4, DataType.INT16]:
+        F = cutil.gen_finn_dt_tensor(dtype, (2, 3, 7))
+        for reverse_inner in [False, True]:
+            eF = pack_innermost_dim_as_hex_string(
+                F, dtype, 128, reverse_inner=reverse_inner
+            ).flatten()
+            eF = [int(x[2:], 16) for x in eF]
+            assert npy_to_rtlsim_input(F, dtype, 128, reverse_inner) == eF
+
+
 def test_numpy_to_hls_code():
     def remove_all_whitespace(s):
         return "".join(s.split())
@@ -28,8 +28,13 @@
 
 import numpy as np
 
+import finn.util.basic as cutil
 from finn.core.datatype import DataType
-from finn.util.data_packing import unpack_innermost_dim_from_hex_string
+from finn.util.data_packing import (
+    npy_to_rtlsim_input,
+    rtlsim_output_to_npy,
+    unpack_innermost_dim_from_hex_string,
+)
 
 
 def test_unpack_innermost_dim_from_hex_string():
@@ -105,3 +110,46 @@ def test_unpack_innermost_dim_from_hex_string():
         E, dtype, shape, 32, reverse_inner=True
     )
     assert (E_unpacked == eE).all()
+
+
+def test_rtlsim_output_to_npy(tmpdir):
+    out_npy_path = str(tmpdir.join("output.npy"))
+    # BINARY
+    dtype = DataType.BINARY
+    shape = (1, 2, 4)
+    eA = [[[1, 1, 1, 0], [0, 1, 1, 0]]]
+    A = rtlsim_output_to_npy([14, 6], out_npy_path, dtype, shape, 8, 1, False)
+    assert (A == eA).all()
+    assert (np.load(out_npy_path) == eA).all()
+
+    # INT2
+    dtype = DataType.INT2
+    shape = (1, 2, 2, 2)
+    eC = [[[[-1, -1], [-1, -1]], [[-1, 1], [1, -1]]]]
+    C = rtlsim_output_to_npy([15, 15, 7, 13], out_npy_path, dtype, shape, 8, 2)
+    assert (C == eC).all()
+    # no npy file is written without a path
+    tmpdir.join("output.npy").remove()
+    C = rtlsim_output_to_npy([15, 15, 7, 13], None, dtype, shape, 8, 2)
+    assert (C == eC).all()
+    assert tmpdir.listdir() == []
+
+    # INT32, packed words wider than 64 bits
+    dtype = DataType.INT32
+    shape = (1, 4)
+    eE = [[-4, 0, -4, -4]]
+    E = 0xFFFFFFFC00000000FFFFFFFCFFFFFFFC
+    E = rtlsim_output_to_npy([E], out_npy_path, dtype, shape, 128, 32, False)
+    assert (E == eE).all()
+
+    # unpacking must invert packing
+    for dtype in [DataType.BIPOLAR, DataType.UINT3, DataType.INT4, DataType.INT16]:
+        F = cutil.gen_finn_dt_tensor(dtype, (2, 3, 7))
+        for reverse_inner in [False, True]:
+            packed = npy_to_rtlsim_input(F, dtype, 128, reverse_inner)
+            target_bits = dtype.bitwidth()
+            F_unpacked = rtlsim_output_to_npy(
+                packed, out_npy_path, dtype, F.shape, 128, target_bits, reverse_inner
+            )
+            assert F_unpacked.dtype == np.float32
+            assert (F_unpacked == F).all()